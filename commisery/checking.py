@@ -16,40 +16,151 @@
 
 # This is a simplistic implementation of checking adherance to Conventional Commits https://www.conventionalcommits.org/
 
+import concurrent.futures
+import dataclasses
 import re
 import subprocess
 import typing
 
 from commisery.config import Configuration
 from commisery.commit import parse_commit_message, CommitMessage
-from commisery.rules import validate_commit_message_rule
+from commisery.rules import applicable_rules, validate_commit_message_rule
+
+_SHA1_RE = re.compile(r"^[0-9a-fA-F]{40}$")
 
 
 def check_commit(commit, config: Configuration):
     """Validates provided commit message against specification"""
-    try:
-        if re.match(r"^[0-9a-fA-F]{40}$", str(commit)):
-            raise IOError("a full commit hash should never be treated as a file")
+    return check_commits((commit,), config)
 
-        with open(commit, encoding="UTF-8") as file:
-            message = file.read()
 
-    except IOError:
-        commit = subprocess.check_output(("git", "rev-parse", commit))[:-1].decode("UTF-8")
-        message = subprocess.check_output(("git", "show", "-q", "--format=%B", commit, "--"))[:-1].decode("UTF-8")
+def check_commits(commits: typing.Iterable, config: Configuration):
+    """
+    Validates the provided commit messages against specification.
 
-    commit_message = parse_commit_message(message)
+    Every entry of `commits` is either a file containing a commit message or a git revision. All revisions are resolved
+    and read with a single `git rev-parse` and a single `git log` invocation, instead of spawning processes per commit.
+
+    Returns the number of commits that failed validation.
+    """
+    # (commit, message) pairs, where the message of a git revision is only filled in after reading all of them at once
+    messages = []
+    for commit in commits:
+        try:
+            if _SHA1_RE.match(str(commit)):
+                raise IOError("a full commit hash should never be treated as a file")
+
+            with open(commit, encoding="UTF-8") as file:
+                messages.append((commit, file.read()))
+
+        except IOError:
+            messages.append((commit, None))
+
+    revisions = [commit for commit, message in messages if message is None]
+    if revisions:
+        # Resolved as given first, as not every revision syntax accepts a suffix (e.g. ':/message' or 'HEAD^@').
+        # The resulting object ids are then peeled to commits, as e.g. an annotated tag's own hash isn't what `git log` lists.
+        object_ids = subprocess.check_output(("git", "rev-parse", *revisions)).decode("UTF-8").split()
+        peeled = subprocess.check_output(("git", "rev-parse", *(f"{object_id}^{{commit}}" for object_id in object_ids)))
+        hexshas = dict(zip(revisions, peeled.decode("UTF-8").split()))
+        bodies = dict(read_commit_messages("--no-walk=unsorted", *hexshas.values()))
+        messages = [
+            (commit, message) if message is not None else (hexshas[commit], bodies[hexshas[commit]]) for commit, message in messages
+        ]
+
+    return check_commit_messages(messages, config)
+
+
+def check_commit_messages(messages: typing.Iterable[typing.Tuple[str, str]], config: Configuration, fail_fast: bool = False):
+    """
+    Validates the provided (commit, message text) pairs against specification.
+
+    When `fail_fast` is set, stops at the first commit that fails validation.
+    Returns the number of commits that failed validation.
+    """
+    error_count = 0
+    for commit, message in messages:
+        commit_message = parse_commit_message(message)
+
+        commit_message.hexsha = commit
+
+        error_count += validate_commit_message(commit_message, config)
+        if fail_fast and error_count:
+            break
+
+    return error_count
+
+
+def check_commit_message(message: str, config: Configuration):
+    """Validates the provided commit message text against specification"""
+    return validate_commit_message(parse_commit_message(message), config)
 
-    commit_message.hexsha = commit
 
-    return validate_commit_message(commit_message, config)
+def read_commit_messages(*revisions: str) -> typing.List[typing.Tuple[str, str]]:
+    """
+    Returns the (commit hash, raw commit message) pairs of all commits `git log` lists for `revisions`.
+
+    All messages are read with a single `git log` invocation, raises `subprocess.CalledProcessError` when git fails.
+    """
+    # Protect the output format against user configuration adding signatures or using another encoding
+    output = subprocess.check_output(
+        ("git", "-c", "log.showSignature=false", "log", "--encoding=UTF-8", "-z", "--format=%H%n%B", *revisions, "--")
+    ).decode("UTF-8")
+
+    messages = []
+    # Every record is terminated by a NUL character, so the final (empty) element is no record
+    for record in output.split("\0")[:-1]:
+        hexsha, _, message = record.partition("\n")
+        messages.append((hexsha, message))
+    return messages
 
 
 def validate_commit_message(message: CommitMessage, config: Configuration):
     """Validates the provided commit message against specification"""
     error_count = 0
-    for rule in config.rules:
+    for rule in applicable_rules(message, config):
         result = validate_commit_message_rule(rule=rule, message=message, config=config)
         error_count += 0 if result.passed else 1
 
     return 1 if error_count > 0 else 0
+
+
+def _rule_errors(message: str, config: Configuration) -> typing.List[str]:
+    commit_message = parse_commit_message(message)
+    results = (
+        validate_commit_message_rule(rule=rule, message=commit_message, config=config) for rule in applicable_rules(commit_message, config)
+    )
+    return [result.message for result in results if not result.passed]
+
+
+# Configuration of a validation worker process, sent once when the process starts instead of along with every message
+_worker_config: typing.Optional[Configuration] = None
+
+
+def _init_worker(config: Configuration):
+    global _worker_config  # pylint: disable=global-statement
+    _worker_config = config
+
+
+def _worker_rule_errors(message: str) -> typing.List[str]:
+    return _rule_errors(message, _worker_config)
+
+
+def validate_commit_messages(
+    messages: typing.Iterable[str], config: typing.Optional[Configuration] = None, workers: typing.Optional[int] = None
+) -> typing.List[typing.List[str]]:
+    """
+    Validates the provided commit message texts against specification, spread over a pool of `workers` processes.
+
+    Meant for large batches, e.g. a project's entire history, as starting the processes takes a while. Nothing gets
+    reported while validating, so that the output of different messages can't interleave; instead, the failed rules'
+    error messages are returned for each message, in order.
+    """
+    config = config or Configuration()
+    # The shared, read-only default tags can't be pickled to send to the workers
+    config = dataclasses.replace(config, silent=True, _tags=dict(config.tags))
+    if workers == 1:
+        return [_rule_errors(message, config) for message in messages]
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(config,)) as executor:
+        return list(executor.map(_worker_rule_errors, messages, chunksize=64))
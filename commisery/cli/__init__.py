@@ -14,31 +14,47 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import functools
+import itertools
 import logging
 import math
 import os
-import re
 import subprocess
 import sys
 
 import click
 import click_log
-from git import Repo, GitCommandError, InvalidGitRepositoryError
 
 from commisery.checking import (
+    _SHA1_RE,
     check_commit,
     validate_commit_message,
 )
-from commisery.cli import inquirer
 from commisery.commit import parse_commit_message
-from commisery.config import DEFAULT_ACCEPTED_TAGS, Configuration, get_default_rules
-from commisery.range import check_commit_rev_range
+from commisery.config import DEFAULT_ACCEPTED_TAGS, Configuration
 from commisery.versioning import GitVersion
 
 log = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 log.addHandler(logging.NullHandler())
 
+_GREY = "\033[90m"
+_GREEN = "\033[92m"
+_RED = "\033[91m"
+_RESET = "\033[0m"
+
+
+def pass_config(f):
+    """Passes the Configuration set up by `main` as the first argument of the decorated command"""
+
+    @click.pass_context
+    def new_func(ctx, *args, **kwargs):
+        # `check` is also installed as the standalone `commisery-verify-msg`, for which `main` never runs
+        config = ctx.obj["CONFIG"] if ctx.obj else Configuration()
+        return ctx.invoke(f, config, *args, **kwargs)
+
+    return functools.update_wrapper(new_func, f)
+
 
 @click.group()
 @click.option("--config", "-c", help="Path towards a configuration file")
@@ -60,7 +76,7 @@ log.addHandler(logging.NullHandler())
     "-d",
     multiple=True,
     help="List of commit message rules to disable.\n"
-    + f"Can be one of:\n{', '.join(get_default_rules().keys())}",
+    + "Run `commisery overview` to list the available rules.",
 )
 @click_log.simple_verbosity_option(__package__.split(".", maxsplit=1)[0])
 @click.pass_context
@@ -85,28 +101,23 @@ def main(ctx, config, tags, max_subject_length, disable):
 
 
 @main.command()
-@click.pass_context
-def overview(ctx):
+@pass_config
+def overview(config):
     """Lists the accepted Conventional Commit tags and Rules (including description)"""
-    ctx.ensure_object(dict)
-    config = ctx.obj["CONFIG"]
-
     print()
     print("Conventional Commit tags")
     print("------------------------")
     for tag, description in config.tags.items():
-        print(f"{tag}: \033[90m{description}\033[0m")
+        print(f"{tag}: {_GREY}{description}{_RESET}")
     print()
 
     print("Commisery Validation rules")
     print("--------------------------")
-    print(
-        "[\033[92mo\033[0m]: \033[90mrule is enabled\033[0m, [\033[91mx\033[0m]: \033[90mrule has been disabled\033[0m"  # pylint: disable=line-too-long
-    )
+    print(f"[{_GREEN}o{_RESET}]: {_GREY}rule is enabled{_RESET}, [{_RED}x{_RESET}]: {_GREY}rule has been disabled{_RESET}")
     print()
     for rule, value in config.rules.items():
-        status = "\033[92mo\033[0m" if value.get("enabled") else "\033[91mx\033[0m"
-        print(f"[{status}] {rule}: \033[90m{value.get('description')}\033[0m")
+        status = f"{_GREEN}o{_RESET}" if value.get("enabled") else f"{_RED}x{_RESET}"
+        print(f"[{status}] {rule}: {_GREY}{value.get('description')}{_RESET}")
     print()
 
 
@@ -120,66 +131,63 @@ def overview(ctx):
 @click.option("-s", "--scope", help="Conventional commit scope")
 @click.option("-d", "--description", help="Commit description")
 @click.option("-b", "--breaking-change", is_flag=True, help="This is a breaking change")
-@click.pass_context
-def commit(ctx, type, scope, description, breaking_change):
+@pass_config
+def commit(config, type, scope, description, breaking_change):
     """Creates a conventional commit"""
-    ctx.ensure_object(dict)
-    config = ctx.obj["CONFIG"]
-
-    def _read_commit_message():
-        questions = []
-
-        if not type:
-            tag_choices = [f"{tag}: {description}" for tag, description in config.tags.items()]
-
-            questions.append(
-                inquirer.Choice(
-                    name="type",
-                    message="Select the (conventional commit) type of your change",
-                    choices=tag_choices,
-                    default=f"fix: {config.tags['fix']}",
-                )
-            )
-
-        if not scope:
-            questions.append(inquirer.Input(name="scope", message="Specify the scope (Optional)"))
-
-        if not description:
-            questions.append(
-                inquirer.Input(name="description", message="Specify the subject of the commit")
-            )
-
-        questions.append(
-            inquirer.Editor(
-                name="body",
-                message="Describe the commit in more details (ESC+ENTER to quit)",
-            )
-        )
-
-        if not breaking_change:
-            questions.append(
-                inquirer.Choice(
-                    name="breaking_change",
-                    message="Is this a change breaking the API",
-                    choices=["Yes", "No"],
-                    default="No",
-                )
-            )
-
-        answers = inquirer.prompt(questions)
-
-        answers["scope"] = answers.get("scope") if answers.get("scope", None) else None
-        answers["type"] = answers.get("type").split(":")[0]
-        answers["breaking_change"] = "!" if answers.get("breaking_change", "No") == "Yes" else ""
-
-        if answers.get("body"):
-            answers["body"] = ("\n" + answers.get("body")).splitlines()
-
-        return CommitMessage(**answers, separator=": ")
-
-    confirmation = False
-    while not confirmation:
-        commit_message = _read_commit_message()
+    # Only needed by this command, so don't make every other command pay for importing them
+    from git import Repo
+    from commisery.cli import inquirer
+
+    questions = {
+        "type": inquirer.Choice(
+            name="type",
+            message="Select the (conventional commit) type of your change",
+            choices=[f"{tag}: {description}" for tag, description in config.tags.items()],
+            default=f"fix: {config.tags['fix']}",
+        ),
+        "scope": inquirer.Input(name="scope", message="Specify the scope (Optional)"),
+        "description": inquirer.Input(name="description", message="Specify the subject of the commit"),
+        "body": inquirer.Editor(
+            name="body",
+            message="Describe the commit in more details (ESC+ENTER to quit)",
+        ),
+        "breaking_change": inquirer.Choice(
+            name="breaking_change",
+            message="Is this a change breaking the API",
+            choices=["Yes", "No"],
+            default="No",
+        ),
+    }
+
+    # Everything not provided on the command line gets asked for
+    answers = {
+        "type": type,
+        "scope": scope,
+        "description": description,
+        "body": None,
+        "breaking_change": "Yes" if breaking_change else None,
+    }
+    unanswered = [name for name, value in answers.items() if not value]
+
+    def _read_answers(names):
+        new_answers = inquirer.prompt([questions[name] for name in names])
+
+        if "type" in new_answers:
+            new_answers["type"] = new_answers["type"].split(":")[0]
+        if "body" in new_answers:
+            new_answers["body"] = [""] + new_answers["body"].splitlines() if new_answers["body"] else None
+
+        answers.update(new_answers)
+
+    def _format_commit_message():
+        scope = f"({answers['scope']})" if answers["scope"] else ""
+        breaking = "!" if answers["breaking_change"] == "Yes" else ""
+        return "\n".join((f"{answers['type']}{scope}{breaking}: {answers['description']}", *(answers["body"] or ())))
+
+    to_ask = unanswered
+    while True:
+        _read_answers(to_ask)
+        commit_message = parse_commit_message(_format_commit_message())
 
         confirmation = inquirer.prompt(
             [
@@ -189,7 +197,7 @@ def commit(ctx, type, scope, description, breaking_change):
 Commit message:
 
 ---
-{commit_message}
+{commit_message.message}
 ---
 
 Is this correct?""",
@@ -197,18 +205,48 @@ Is this correct?""",
                 )
             ]
         ).get("confirmation")
+        if confirmation:
+            break
+
+        # Only ask again for what needs changing, instead of going through all questions again
+        to_edit = inquirer.prompt(
+            [
+                inquirer.Choice(
+                    name="edit",
+                    message="What do you want to change",
+                    choices=[*questions, "start over"],
+                    default="description",
+                )
+            ]
+        ).get("edit")
+        to_ask = unanswered if to_edit == "start over" else [to_edit]
 
     print(os.linesep)
 
     if validate_commit_message(commit_message, config) == 0:
         repo = Repo(os.getcwd(), search_parent_directories=True)
-        repo.index.commit(message=str(commit_message))
+        repo.index.commit(message=commit_message.message)
+
+
+def _may_be_rev_range(target):
+    """
+    Tells whether `target` could describe more than a single commit, without spawning git.
+
+    Only revision ranges (`A..B`, `A...B`), negations and parent shorthands (`^A`, `A^@`, `A^!`), options (`--all`) or
+    multiple revisions can; plain refs like `HEAD` or branch names, full hashes and files never do.
+    """
+    target_str = " ".join(target)
+    if _SHA1_RE.match(target_str) or os.path.exists(target_str):
+        return False
+
+    return len(target) > 1 or ".." in target_str or "^" in target_str or target_str.startswith("-")
 
 
 @main.command()
 @click.argument("target", nargs=-1)
-@click.pass_context
-def check(ctx, target):
+@click.option("--fail-fast", is_flag=True, help="Stop checking a revision range at the first commit that fails validation")
+@pass_config
+def check(config, target, fail_fast):
     """
     Checks whether commit messages adhere to the Convention Commits standard.
 
@@ -223,25 +261,22 @@ def check(ctx, target):
     and/or whether the commits in the revision range should contain a ticket reference.
     """
 
-    ctx.ensure_object(dict)
-    config = ctx.obj.get("CONFIG", Configuration())
-
     target = target or ("HEAD",)
     target_str = " ".join(target)
 
     try:
+        # Every revision is printed on its own line, so more than one line means more than one revision
         if (
-            not re.match(r"^[0-9a-fA-F]{40}$", target_str)
-            and not os.path.exists(target_str)
-            and len(
-                subprocess.check_output(("git", "rev-parse") + target, stderr=subprocess.DEVNULL)
-                .decode(encoding="UTF-8")
-                .splitlines()
-            )
+            _may_be_rev_range(target)
+            and subprocess.run(
+                ("git", "rev-parse") + target, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True
+            ).stdout.count(b"\n")
             > 1
         ):
             log.debug(f"Handling as range: %s", target_str)
-            result = check_commit_rev_range(target, config=config)
+            from commisery.range import check_commit_rev_range
+
+            result = check_commit_rev_range(target, config=config, fail_fast=fail_fast)
         else:
             log.debug(f"Handling as commitish: %s", target_str)
             result = check_commit(target_str, config=config)
@@ -254,8 +289,9 @@ def check(ctx, target):
 
 @main.command()
 @click.argument("target", default="")
+@pass_config
 @click.pass_context
-def next_version(ctx, target):
+def next_version(ctx, config, target):
     """
     Provides the next version based on Conventional Commit messages since the
     last tag.
@@ -280,7 +316,8 @@ def next_version(ctx, target):
       - exits with 2 if the commits version is not bumped
       - exits with 1 on any trouble (no version tag found, invalid input, etc.)
     """
-    config = ctx.obj["CONFIG"]
+    from git import Repo, GitCommandError, InvalidGitRepositoryError
+
     valid_repo = False
     try:
         repo = Repo(search_parent_directories=True)
@@ -326,22 +363,25 @@ def next_version(ctx, target):
 
     if target and os.path.exists(target):
         with open(target, "r") as file:
-            commits = (file.read(),)
+            first_commit, commits = file.read(), ()
     elif version.exact or current_version is None:
         # We're either on the latest tag or the current latest tag is not parseable
         log.info("Nothing to bump")
         ctx.exit(2)
     elif target:
         try:
-            commits = tuple(repo.iter_commits(rev=target))
+            commits = repo.iter_commits(rev=target)
+            first_commit = next(commits, None)
         except GitCommandError:
             log.error(f"Provided target '{target}' is invalid")
             ctx.exit(1)
     else:
-        current_tag = repo.git.describe(tags=True, abbrev=0)
-        commits = tuple(repo.iter_commits(rev=(f"^{current_tag}", "HEAD")))
+        # The long description above already names the tag it counted from, no need to ask `git describe` again
+        commits = repo.iter_commits(rev=(f"^{version.tag_name}", "HEAD"))
+        first_commit = next(commits, None)
 
-    if len(tuple(commits)) == 0:
+    # Commits are validated while git is still listing them, only the first one is needed to know there are any
+    if first_commit is None:
         if target:
             if os.path.exists(target):
                 log.error("The file '%s' is empty" % target)
@@ -354,14 +394,14 @@ def next_version(ctx, target):
     # We only want to get a list of correct conventional commits to consider; disable error output
     config.silent = True
 
-    log.debug("Yielding " + str(commits))
     def _check_commits(commits):
         for commit in commits:
+            log.debug("Yielding %s", commit)
             msg = parse_commit_message(commit if isinstance(commit, str) else commit.message)
             if validate_commit_message(msg, config) == 0:
                 yield msg
 
-    new_version = current_version.next_version_for_commits(_check_commits(commits))
+    new_version = current_version.next_version_for_commits(_check_commits(itertools.chain((first_commit,), commits)))
     if new_version > current_version:
         print(new_version)
         ctx.exit(0)
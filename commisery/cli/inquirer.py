@@ -16,7 +16,7 @@
 
 """Helper methods for inquirer2"""
 
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass, field
 from typing import Optional, Sequence
 
 import inquirer2.prompt
@@ -63,4 +63,5 @@ class Confirm:
 
 def prompt(questions) -> dict:
     """Prompt questions on the CLI"""
-    return inquirer2.prompt.prompt([asdict(question) for question in questions])
+    # Shallow copies suffice: unlike `asdict` this doesn't deep-copy the (possibly long) list of choices every time
+    return inquirer2.prompt.prompt([dict(vars(question)) for question in questions])
@@ -12,15 +12,47 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import bisect
 from collections import namedtuple
+import itertools
 import re
+import sys
 import typing
 
-import git
+if typing.TYPE_CHECKING:
+    import git
+
+if sys.version_info[:2] >= (3, 8):
+    from functools import cached_property
+else:
+
+    class cached_property(object):
+        """Minimal stand-in for Python 3.8's `functools.cached_property`"""
+
+        def __init__(self, func):
+            self.func = func
+            self.__doc__ = func.__doc__
+
+        def __get__(self, instance, owner=None):
+            if instance is None:
+                return self
+            value = instance.__dict__[self.func.__name__] = self.func(instance)
+            return value
+
 
 BREAKING_CHANGE_TOKEN = "BREAKING CHANGE"
 
-_Footer = namedtuple("_Footer", ("token", "value"))
+# Everything from this line on is ignored by git when committing with `--cleanup=scissors`
+_CUT_LINE = "# ------------------------ >8 ------------------------\n"
+
+
+class _Footer(namedtuple("_Footer", ("token", "value"))):
+    __slots__ = ()
+
+    @property
+    def is_breaking(self) -> bool:
+        """Whether this is the BREAKING CHANGE footer"""
+        return self.token == BREAKING_CHANGE_TOKEN
 
 
 class ParsingError(RuntimeError):
@@ -31,10 +63,14 @@ class CommitMessage(object):
     line_separator = "\n"
     paragraph_separator = "\n\n"
     autosquash_re = re.compile(r"^(?:(?:fixup|squash)!\s+)+")
-    merge_re = re.compile(r"^Merge.*?:[ \t]*")
+    # Unanchored, as it gets matched right after the autosquash prefix (`.match` only matches at that position anyway)
+    merge_re = re.compile(r"Merge.*?:[ \t]*")
+    # Subjects of merge commits as generated by git or forges, which don't follow the conventional commit format
+    acceptable_merge_re = re.compile(r"^Merge (?:branch|tag|pull[ -]request) .*?(?: into .*)?$")
 
     # Variation of conventional commits footer that more closely matches 'git trailers'.
     # In particular it doesn't permit 'BREAKING CHANGE' (with a space, instead of '-') as a footer's token.
+    # Like git, only ASCII alphanumerics are accepted for tokens (which also keeps `\w` a cheap table lookup).
     footer_re = re.compile(
         r"""
     # 8.  One or more footers MAY be provided one blank line after the body. ...
@@ -52,12 +88,15 @@ class CommitMessage(object):
     #     trailer convention).
     (?::[ ]|[ ](?=[#]))
     """,
-        re.VERBOSE,
+        re.VERBOSE | re.ASCII,
     )
 
     def __init__(self, message, hexsha=None):
         if isinstance(message, str):
             self.message = _strip_message(message)
+        elif isinstance(message, (bytes, bytearray)):
+            # e.g. straight from `git log` output, decoded only once here
+            self.message = _strip_message(message.decode("UTF-8", errors="replace"))
         else:
             self.message = _strip_message(message.message)
             try:
@@ -68,30 +107,53 @@ class CommitMessage(object):
         self.hexsha = hexsha
 
         # Discover starts of lines
-        self._line_index = [m.end() for m in re.finditer(self.line_separator, self.message)]
-        self._line_index.insert(0, 0)
-        if len(self._line_index) < 2 or self._line_index[-1] < len(self.message):
-            self._line_index.append(len(self.message) + 1)
+        line_index = [0]
+        line_index.extend(_separator_ends(self.message, self.line_separator))
+        if len(line_index) < 2 or line_index[-1] < len(self.message):
+            line_index.append(len(self.message) + 1)
+        self._line_index = tuple(line_index)
 
         autosquash = self.autosquash_re.match(self.message)
         self._autosquash_end = autosquash.end() if autosquash is not None else 0
 
-        merge = self.merge_re.match(self.message[self._autosquash_end :])
-        self._subject_start = self._autosquash_end + (merge.end() if merge is not None else 0)
+        merge = self.merge_re.match(self.message, self._autosquash_end)
+        self._subject_start = merge.end() if merge is not None else self._autosquash_end
 
-        # Discover starts of paragraphs
-        self._paragraph_index = [m.end() for m in re.finditer(self.paragraph_separator, self.message)]
+        # The subject is consulted by nearly every rule, only slice it once
+        self._full_subject = self.message[: self.subject_end]
+        self._subject = self._full_subject[self._subject_start :]
+
+    @cached_property
+    def _paragraph_index(self):
+        """Starts of paragraphs"""
+        paragraph_index = []
         if not self.message[self._line_index[1] - len(self.line_separator) :].startswith(self.paragraph_separator):
-            self._paragraph_index.insert(0, self._line_index[1])
-        self._paragraph_index.append(len(self.message) + len(self.paragraph_separator))
+            paragraph_index.append(self._line_index[1])
+        paragraph_index.extend(_separator_ends(self.message, self.paragraph_separator))
+        paragraph_index.append(len(self.message) + len(self.paragraph_separator))
 
         # Strip last line terminator from the last paragraph.
         if self.message and self.message[-1] == self.line_separator:
-            self._paragraph_index[-1] -= 1
+            paragraph_index[-1] -= 1
 
-        self._footer_index = [(m.group("token"), m.start(), m.end()) for m in self.footer_re.finditer(self.message)]
+        return tuple(paragraph_index)
 
-    @property
+    @cached_property
+    def _footer_index(self):
+        """Token, start and value start of every footer"""
+        # 10. A footer's value MAY contain spaces and newlines, and parsing MUST terminate when the next valid footer
+        #     token/separator pair is observed.
+        # NOTE: `footer_re` resolves to the subclass' variant, so this is the only footer scan needed
+        # Every footer follows a line terminator, so none can start before the end of the subject. Footers may be
+        # spread over multiple paragraphs (C022 reports that), so the scan can't be limited to the last paragraph.
+        # Without any of the literal separators (`: ` or ` #`) past the subject there's no need to run the regex at all.
+        if self.message.find(": ", self.subject_end) < 0 and self.message.find(" #", self.subject_end) < 0:
+            return ()
+        return tuple(
+            (m.group("token"), m.start(), m.end()) for m in self.footer_re.finditer(self.message, self.subject_end)
+        )
+
+    @cached_property
     def lines(self):
         return _IndexedList(self.message, self._line_index, self.line_separator)
 
@@ -105,11 +167,16 @@ class CommitMessage(object):
 
     @property
     def full_subject(self):
-        return self.message[: self.subject_end]
+        return self._full_subject
 
     @property
     def subject(self):
-        return self.full_subject[self.subject_start :]
+        return self._subject
+
+    @cached_property
+    def is_acceptable_merge(self):
+        """Whether the subject is that of a merge commit as generated by git or forges"""
+        return self.acceptable_merge_re.match(self.subject) is not None
 
     @property
     def autosquash_end(self):
@@ -130,22 +197,23 @@ class CommitMessage(object):
     def body(self):
         return self.message[self.body_start :]
 
-    @property
+    @cached_property
     def paragraphs(self):
         return _IndexedList(self.message, self._paragraph_index, self.paragraph_separator)
 
     def paragraph_line(self, idx):
         if idx < 0:
             idx += len(self._paragraph_index) - 1
-        idx = self._paragraph_index[idx]
-        return self.message[:idx].count(self.line_separator)
+        idx = min(self._paragraph_index[idx], len(self.message))
+        # Every line start past the first one follows a line separator
+        return bisect.bisect_right(self._line_index, idx) - 1
 
     def footer_start(self, nr):
         if not self._footer_index or len(self._footer_index) <= nr:
             return None
         return self._footer_index[nr][1]
 
-    @property
+    @cached_property
     def footers(self):
         return FooterList(self.message, self._footer_index)
 
@@ -236,27 +304,22 @@ class ConventionalCommit(CommitMessage):
     #     trailer convention).
     (?::[ ]|[ ](?=[#]))
     """,
-        re.VERBOSE,
+        re.VERBOSE | re.ASCII,
     )
 
     def __init__(self, message, hexsha=None):
         super().__init__(message, hexsha=hexsha)
-        m = self.conv_subject_re.match(self.subject)
-        if not m:
+        # conv_subject_re documents the grammar (and is reported on failure), _parse_subject implements it
+        parts = _parse_subject(self.subject)
+        if parts is None:
             raise ParsingError(
                 f"commit message's subject ({self.subject!r}) not formatted according to Conventional Commits ({self.conv_subject_re.pattern})"
             )
-        self._type_tag = m.group("type_tag")
-        self._scope = m.group("scope")
-        self._breaking_subject = m.group("breaking")
-        self._description = m.group("description")
-        self._separator = m.group("separator")
+        self._type_tag, self._scope, self._breaking_subject, self._separator, self._description = parts
+        # Tags are case insensitive for the has_*() predicates, which version bumping calls for every commit
+        self._type_tag_lower = self._type_tag.lower()
 
-        # 10. A footer's value MAY contain spaces and newlines, and parsing MUST terminate when the next valid footer
-        #     token/separator pair is observed.
-        self._footer_index = [(m.group("token"), m.start(), m.end()) for m in self.footer_re.finditer(self.message)]
-
-    @property
+    @cached_property
     def footers(self):
         return ConventionalFooterList(self.message, self._footer_index)
 
@@ -284,21 +347,24 @@ class ConventionalCommit(CommitMessage):
         if self._breaking_subject:
             return True
 
-        for token, _ in self.footers:
-            if token == BREAKING_CHANGE_TOKEN:
-                return True
+        # Both accepted breaking change tokens contain this, so skip scanning the footers of the vast majority of messages
+        if "BREAKING" not in self.message:
+            return False
 
-        return False
+        # Compare the indexed tokens directly instead of materializing every footer's value. This must stay a case
+        # sensitive comparison, unlike looking the token up in `footers`.
+        # 16. `BREAKING-CHANGE` MUST be synonymous with `BREAKING CHANGE`, when used as a token in a footer.
+        return any(token in (BREAKING_CHANGE_TOKEN, "BREAKING-CHANGE") for token, _, _ in self._footer_index)
 
     def has_new_feature(self):
-        return self._type_tag.lower() == "feat"
+        return self._type_tag_lower == "feat"
 
     def has_fix(self):
-        return self._type_tag.lower() == "fix"
+        return self._type_tag_lower == "fix"
 
 
 def parse_commit_message(
-    message: typing.Union[git.Commit, str], policy: typing.Optional[str] = "conventional-commits", strict=False
+    message: typing.Union["git.Commit", str, bytes], policy: typing.Optional[str] = "conventional-commits", strict=False
 ) -> typing.Union[ConventionalCommit, CommitMessage]:
     """
     Returns a ConventionalCommit object (or a CommitMessage object if it can't be parsed as such).
@@ -323,10 +389,13 @@ def parse_commit_message(
 
 
 class _IndexedList(object):
+    __slots__ = ("_message", "_index", "separator", "_seplen")
+
     def __init__(self, message, index, separator):
         self._message = message
         self._index = index
         self.separator = separator
+        self._seplen = len(separator)
 
     def __len__(self):
         return len(self._index) - 1
@@ -334,23 +403,37 @@ class _IndexedList(object):
     def __getitem__(self, idx):
         if idx < 0:
             idx += len(self)
-        return self._message[self._index[idx] : self._index[idx + 1] - len(self.separator)]
+        return self._message[self._index[idx] : self._index[idx + 1] - self._seplen]
+
+    def __iter__(self):
+        message, seplen = self._message, self._seplen
+        for start, end in zip(self._index, itertools.islice(self._index, 1, None)):
+            yield message[start : end - seplen]
 
 
 class FooterList(object):
+    __slots__ = ("_message", "_index", "_values_by_token")
+
     def __init__(self, message, index):
         self._message = message
         self._index = index
+        self._values_by_token = None
 
     def __len__(self):
         return len(self._index)
 
     def __getitem__(self, idx):
         if isinstance(idx, str):
-            matches = [footer.value for footer in self if footer.token.casefold() == idx.casefold()]
+            # Group all values by their token once, instead of going through every footer on every lookup
+            if self._values_by_token is None:
+                self._values_by_token = {}
+                for footer in self:
+                    self._values_by_token.setdefault(footer.token.casefold(), []).append(footer.value)
+
+            matches = self._values_by_token.get(idx.casefold())
             if not matches:
                 raise KeyError(f"{idx} not found in footer list")
-            return matches
+            return list(matches)
 
         if idx < 0:
             idx += len(self)
@@ -375,6 +458,8 @@ class FooterList(object):
 
 
 class ConventionalFooterList(FooterList):
+    __slots__ = ()
+
     def __getitem__(self, idx):
         # 16. `BREAKING-CHANGE` MUST be synonymous with `BREAKING CHANGE`, when used as a token in a footer.
         if isinstance(idx, str):
@@ -388,19 +473,90 @@ class ConventionalFooterList(FooterList):
         return footer
 
 
+def _separator_ends(message, separator):
+    """Yields the index just past every non-overlapping occurrence of `separator` in `message`"""
+    pos = message.find(separator)
+    while pos >= 0:
+        pos += len(separator)
+        yield pos
+        pos = message.find(separator, pos)
+
+
+def _skip_whitespace(text, pos):
+    """Returns the index of the first non-whitespace character in `text` at or after `pos`"""
+    end = len(text)
+    while pos < end and text[pos].isspace():
+        pos += 1
+    return pos
+
+
+def _parse_subject(subject):
+    """
+    Splits a single-line `subject` the same way ConventionalCommit.conv_subject_re would, in a single linear scan.
+
+    Returns a (type_tag, scope, breaking, separator, description) tuple, or None when `subject` doesn't start with a
+    type tag. Optional parts that are absent are returned as None, just like unmatched regex groups.
+    """
+    end = len(subject)
+
+    # type_tag: \w+
+    pos = 0
+    while pos < end and (subject[pos].isalnum() or subject[pos] == "_"):
+        pos += 1
+    if pos == 0:
+        return None
+    type_tag = subject[:pos]
+
+    # scope: optional \( [^()]* \)
+    scope = None
+    if pos < end and subject[pos] == "(":
+        close = subject.find(")", pos + 1)
+        if close >= 0 and subject.find("(", pos + 1, close) < 0:
+            scope = subject[pos + 1 : close]
+            pos = close + 1
+
+    # breaking: optional \s*!+ including trailing whitespace only when it is followed by a colon
+    breaking = None
+    bang = _skip_whitespace(subject, pos)
+    if bang < end and subject[bang] == "!":
+        while bang < end and subject[bang] == "!":
+            bang += 1
+        colon = _skip_whitespace(subject, bang)
+        if colon > bang and colon < end and subject[colon] == ":":
+            bang = colon
+        breaking = subject[pos:bang]
+        pos = bang
+
+    # separator: [ ]*:?[ ]?
+    sep_end = pos
+    while sep_end < end and subject[sep_end] == " ":
+        sep_end += 1
+    if sep_end < end and subject[sep_end] == ":":
+        sep_end += 1
+    if sep_end < end and subject[sep_end] == " ":
+        sep_end += 1
+
+    return type_tag, scope, breaking, subject[pos:sep_end], subject[sep_end:]
+
+
 def _strip_message(message):
-    cut_line = message.find("# ------------------------ >8 ------------------------\n")
+    cut_line = message.find(_CUT_LINE)
     if cut_line >= 0 and (cut_line == 0 or message[cut_line - 1] == "\n"):
         message = message[:cut_line]
 
-    # Strip comments
-    message = re.sub(r"^#[^\n]*\n?", "", message, flags=re.MULTILINE)
-    # Strip trailing whitespace from lines
-    message = re.sub(r"[ \t]+$", "", message, flags=re.MULTILINE)
-    # Remove empty lines from the beginning and end
-    while message[:1] == "\n":
-        message = message[1:]
-    while message[-2:] == "\n\n":
-        message = message[:-1]
-
-    return message
+    # Strip comment lines and trailing whitespace of all other lines in a single pass. A comment on the last line
+    # leaves the line terminator preceding it in place.
+    lines = message.split("\n")
+    trailing_comment = lines[-1].startswith("#")
+    lines = [line.rstrip(" \t") for line in lines if not line.startswith("#")]
+    if trailing_comment:
+        lines.append("")
+
+    # Remove empty lines from the beginning and end, keeping a single line terminator
+    start, end = 0, len(lines)
+    while start < end - 1 and not lines[start]:
+        start += 1
+    while end - start > 2 and not lines[end - 1] and not lines[end - 2]:
+        end -= 1
+
+    return "\n".join(lines[start:end])
@@ -14,15 +14,23 @@
 
 """Configuration"""
 
+import functools
 from inspect import getmembers, isfunction
+import json
 import os
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 import re
 import sys
+import types
 from typing import Mapping
 import yaml
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader
+
 DEFAULT_CONFIGURATION_FILE = ".commisery.yml"
 DEFAULT_ACCEPTED_TAGS = {
     "fix": "Patches a bug in your codebase",
@@ -40,19 +48,37 @@ DEFAULT_ACCEPTED_TAGS = {
 }
 
 
+# Read-only view shared by all configurations using the default tags
+_DEFAULT_TAGS = types.MappingProxyType(DEFAULT_ACCEPTED_TAGS)
+
+# Expected types of the (optional) top-level items in a configuration file
+_EXPECTED_TYPES = {
+    "max-subject-length": int,
+    "tags": dict,
+    "disable": list,
+}
+
+_RULE_RE = re.compile(r"(?P<rule>C[0-9]{3})_.*")
+
+
+@functools.lru_cache(maxsize=None)
+def _default_rules():
+    rules = {}
+    for name, obj in getmembers(sys.modules["commisery.rules"], isfunction):
+        match = _RULE_RE.match(name)
+        if match:
+            rules[match.group("rule")] = {
+                "description": obj.__doc__,
+                "obj": obj,
+                "enabled": True,
+            }
+    return rules
+
+
 def get_default_rules():
     """Determine the default Commit Message ruleset"""
-    rule_re = re.compile(r"(?P<rule>C[0-9]{3})_.*")
-
-    return {
-        rule_re.match(name).group("rule"): {
-            "description": obj.__doc__,
-            "obj": obj,
-            "enabled": True,
-        }
-        for name, obj in getmembers(sys.modules["commisery.rules"], isfunction)
-        if rule_re.match(name)
-    }
+    # Every caller gets its own copy, as rules get enabled/disabled per configuration
+    return {rule: dict(settings) for rule, settings in _default_rules().items()}
 
 
 @dataclass
@@ -60,7 +86,7 @@ class Configuration:
     """Configuration"""
 
     max_subject_length: int = 80
-    _tags: Mapping = field(default_factory=lambda: DEFAULT_ACCEPTED_TAGS)
+    _tags: Mapping = field(default_factory=lambda: _DEFAULT_TAGS)
     rules: Mapping = field(default_factory=lambda: get_default_rules())
     silent: bool = False
 
@@ -78,10 +104,22 @@ class Configuration:
     @tags.setter
     def tags(self, tags: Mapping):
         """Sets the provided tag types, while ensuring that fix and feat are always present"""
+        if tags is _DEFAULT_TAGS:
+            self._tags = tags
+            return
+
+        # Copied, so that neither the caller's mapping nor the defaults get modified
+        tags = dict(tags)
         tags.setdefault("fix", DEFAULT_ACCEPTED_TAGS["fix"])
         tags.setdefault("feat", DEFAULT_ACCEPTED_TAGS["feat"])
         self._tags = tags
 
+    @property
+    def enabled_rules(self):
+        """Identifiers of the rules that are enabled"""
+        # Not cached: rules get enabled/disabled in place after construction
+        return [rule for rule, settings in self.rules.items() if settings.get("enabled")]
+
     @classmethod
     def from_yaml(cls, config_path: str):
         """Converts yaml file to class instance"""
@@ -94,32 +132,35 @@ class Configuration:
         if not os.path.exists(config_path):
             return cls()
 
+        # Parsing is only redone when the file changed, each caller gets its own copy to modify
+        stat = os.stat(config_path)
+        config = cls._from_file(os.path.abspath(config_path), stat.st_mtime_ns, stat.st_size)
+        return replace(config, rules={rule: dict(settings) for rule, settings in config.rules.items()})
+
+    @classmethod
+    @functools.lru_cache(maxsize=8)
+    def _from_file(cls, config_path: str, mtime_ns: int, size: int):
+        """Parses the yaml file at `config_path`; its modification time and size are part of the cache key to notice changes"""
         with open(config_path, encoding="utf8") as file:
-            data = yaml.safe_load(file)
-
-            if not isinstance(data, dict):
-                raise TypeError(f"'{config_path}' got an unexpected keyword type for the root")
-
-            for item, expected in [
-                ("max-subject-length", Configuration.max_subject_length),
-                (
-                    "tags",
-                    {},
-                ),  # Configuration.tags is not (yet) initialized at this stage due to usage of the `default_factory`
-                (
-                    "disable",
-                    [],
-                ),  # Configuration.disable is not (yet) initialized at this stage due to usage of the `default_factory`
-            ]:
-                value = data.get(item, None)
-                if value and not isinstance(value, type(expected)):
-                    raise TypeError(
-                        f"'{config_path}' got an unexpected type '{type(value).__name__}' for '{item}', expected '{type(expected).__name__}'"
-                    )
-
-            data["rules"] = get_default_rules().copy()
-            for rule in data.pop("disable", []):
-                data["rules"][rule]["enabled"] = False
-
-            data["_tags"] = data.pop("tags", DEFAULT_ACCEPTED_TAGS)
-            return cls(**{key.replace("-", "_"): value for key, value in data.items()})
+            # JSON is a subset of YAML, but the json module parses it a lot faster
+            if config_path.endswith(".json"):
+                data = json.load(file)
+            else:
+                data = yaml.load(file, Loader=_SafeLoader)
+
+        if not isinstance(data, dict):
+            raise TypeError(f"'{config_path}' got an unexpected keyword type for the root")
+
+        for item, expected in _EXPECTED_TYPES.items():
+            value = data.get(item, None)
+            if value and not isinstance(value, expected):
+                raise TypeError(
+                    f"'{config_path}' got an unexpected type '{type(value).__name__}' for '{item}', expected '{expected.__name__}'"
+                )
+
+        data["rules"] = get_default_rules()
+        for rule in data.pop("disable", []):
+            data["rules"][rule]["enabled"] = False
+
+        data["_tags"] = data.pop("tags", _DEFAULT_TAGS)
+        return cls(**{key.replace("-", "_"): value for key, value in data.items()})
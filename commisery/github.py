@@ -15,10 +15,8 @@
 # limitations under the License.
 
 import click
-import tempfile
 from commisery.config import Configuration
 
-from github import Github
 from . import checking
 
 DEPENDABOT_USER = "dependabot[bot]"
@@ -26,20 +24,22 @@ DEPENDABOT_SUBJECT_LENGTH_OVERRIDE = 160
 
 
 def check_message(message: str, config: Configuration) -> bool:
-    with tempfile.NamedTemporaryFile() as tmp:
-        tmp.write(message.encode("UTF-8"))
-        tmp.flush()
-        return checking.check_commit(tmp.name, config) == 0
+    return checking.check_commit_message(message, config) == 0
 
 
 @click.command()
 @click.option("-t", "--token", required=True, help="GitHub Token")
 @click.option("-r", "--repository", required=True, help="GitHub repository")
 @click.option("-p", "--pull-request-id", required=True, help="Pull Request identifier")
-def main(token: str, repository: str, pull_request_id: int) -> int:
+@click.option("--fail-fast", is_flag=True, help="Stop at the first message that fails validation")
+def main(token: str, repository: str, pull_request_id: int, fail_fast: bool) -> int:
+    # PyGithub pulls in requests and cryptography, only pay for it when actually talking to GitHub
+    from github import Github
+
     errors = 0
 
-    repo = Github(token).get_repo(repository)
+    # The commit listing of a pull request already contains every message, so the only requests to save are pages
+    repo = Github(token, per_page=100).get_repo(repository)
     pr = repo.get_pull(int(pull_request_id))
 
     config = Configuration()
@@ -48,12 +48,16 @@ def main(token: str, repository: str, pull_request_id: int) -> int:
 
     if not check_message(pr.title, config):
         errors += 1
+        if fail_fast:
+            exit(1)
 
     commits = pr.get_commits()
 
     for commit_info in commits:
         if not check_message(commit_info.commit.message, config):
             errors += 1
+            if fail_fast:
+                exit(1)
 
     exit(1 if errors else 0)
 
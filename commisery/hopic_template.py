@@ -23,6 +23,8 @@ from typing import (
 from hopic.errors import ConfigurationError
 from hopic.template.utils import module_command
 
+_SHA_RE = re.compile(r"[0-9a-fA-F]{40}|[0-9a-fA-F]{64}")
+
 
 def _commisery_command(*ranges: str, **kwargs):
     return module_command("commisery.checking", *ranges, **kwargs)
@@ -38,7 +40,7 @@ def commisery(
         exclude_commits = (exclude_commits,)
 
     for idx, commit in enumerate(exclude_commits):
-        if not re.match(r"^(?:[0-9a-fA-F]{40}|[0-9a-fA-F]{64})$", commit):
+        if not _SHA_RE.fullmatch(commit):
             raise ConfigurationError(
                 f"option 'commisery.exclude-commits[{idx}] is not a full SHA-1 or SHA-256 commit hash but '{commit}' instead"
             )
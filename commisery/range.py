@@ -15,19 +15,19 @@
 # limitations under the License.
 
 import logging
-
-import git
+import subprocess
 
 from commisery.config import Configuration
 from commisery.checking import (
-    check_commit,
+    check_commit_messages,
+    read_commit_messages,
 )
 
 
 log = logging.getLogger(__name__)
 
 
-def check_commit_rev_range(revision_range, config: Configuration):
+def check_commit_rev_range(revision_range, config: Configuration, fail_fast: bool = False):
     """
     Checks commit messages of the commits in the provided revision range.
 
@@ -36,45 +36,41 @@ def check_commit_rev_range(revision_range, config: Configuration):
         custom_accepted_tags: an optional list of conventional commit tags to allow besides 'feat' and 'fix'
         require_ticket: when set to true, requires a Jira-style ticket to be present anywhere in the commit message
                 in one of the commits described by revision_range
+        fail_fast: when set to true, stops checking at the first commit that fails validation
 
     Returns:
         1 on failure, 0 on success.
     """
-    log.debug("Revision range: %s", " ".join(revision_range))
+    import git
+
+    range_str = " ".join(revision_range)
+    debug = log.isEnabledFor(logging.DEBUG)
+    if debug:
+        log.debug("Revision range: %s", range_str)
 
-    if config.tags:
-        log.debug("Custom accepted tags: %s", " ".join(config.tags))
+        if config.tags:
+            log.debug("Custom accepted tags: %s", " ".join(config.tags))
 
     try:
         with git.Repo(search_parent_directories=True) as repo:
             try:
-                commits = list(repo.iter_commits(rev=revision_range))
-            except git.GitCommandError:
-                log.exception(
-                    "Error getting list of commits from revision range: %s",
-                    " ".join(revision_range),
-                )
+                # Reads all messages at once, instead of having GitPython look up every commit object separately
+                commits = read_commit_messages(*revision_range)
+            except subprocess.CalledProcessError:
+                log.exception("Error getting list of commits from revision range: %s", range_str)
                 return 1
 
-            log.debug(
-                "Repo at %s has %d commits for range: %s",
-                repo.working_dir,
-                len(commits),
-                " ".join(revision_range),
-            )
-            error_count = 0
-
-            for commit in commits:
-                log.debug("Checking commit: %s", commit.hexsha)
-                error_count += check_commit(commit.hexsha, config=config)
-
-            log.debug(
-                "Done checking commits{}".format(
-                    f', {error_count} error{"s" if error_count > 1 else ""} found'
-                    if error_count
-                    else "",
+            log.debug("Repo at %s has %d commits for range: %s", repo.working_dir, len(commits), range_str)
+            error_count = check_commit_messages(commits, config=config, fail_fast=fail_fast)
+
+            if debug:
+                log.debug(
+                    "Done checking commits{}".format(
+                        f', {error_count} error{"s" if error_count > 1 else ""} found'
+                        if error_count
+                        else "",
+                    )
                 )
-            )
 
             if error_count == 0:
                 return 0
@@ -14,17 +14,75 @@
 
 from dataclasses import dataclass
 import difflib
+import functools
 import os
 import re
 import typing
 
 import llvm_diagnostics as logging
 
-from commisery.commit import BREAKING_CHANGE_TOKEN, CommitMessage, ParsingError
-from commisery.config import Configuration, get_default_rules
+try:
+    from rapidfuzz import fuzz, process as fuzz_process
+except ImportError:  # rapidfuzz is optional, fall back to difflib when it's not installed
+    fuzz_process = None
+
+from commisery.commit import CommitMessage, ParsingError
+from commisery.config import Configuration
 
 # pylint: disable=C0103  # disable `invalid-name`-checking
 
+_TRAILING_PUNCTUATION = (".", "!", "?", ",")
+_ISSUE_RE = re.compile(r"\b([A-Z]+)-[0-9]+\b")
+_NON_ISSUE_PREFIXES = frozenset(
+    (
+        "AES",  # AES-128
+        "PEP",  # PEP-440
+        "SHA",  # SHA-256
+        "UTF",  # UTF-8
+        "VT",  # VT-220
+    )
+)
+_COMMON_NON_IMPERATIVE_VERBS = (
+    "added",
+    "adds",
+    "adding",
+    "applied",
+    "applies",
+    "applying",
+    "edited",
+    "edits",
+    "editing",
+    "expanded",
+    "expands",
+    "expanding",
+    "fixed",
+    "fixes",
+    "fixing",
+    "removed",
+    "removes",
+    "removing",
+    "renamed",
+    "renames",
+    "renaming",
+    "deleted",
+    "deletes",
+    "deleting",
+    "updated",
+    "updates",
+    "updating",
+    "ensured",
+    "ensures",
+    "ensuring",
+    "resolved",
+    "resolves",
+    "resolving",
+    "verified",
+    "verifies",
+    "verifying",
+)
+_NON_IMPERATIVE_VERBS = frozenset(_COMMON_NON_IMPERATIVE_VERBS)
+_NON_IMPERATIVE_VERB_LENGTHS = sorted({len(verb) for verb in _COMMON_NON_IMPERATIVE_VERBS})
+
 
 @dataclass
 class RuleResult:
@@ -33,19 +91,47 @@ class RuleResult:
 
 
 def _is_acceptable_merge_message(message: CommitMessage):
-    return re.match(r"^Merge (?:branch|tag|pull[ -]request) .*?(?: into .*)?$", message.subject) is not None
+    return message.is_acceptable_merge
 
 
-def C001_non_lower_case_type(message: CommitMessage, config: Configuration):
-    """The commit message's type tag should be in lower case"""
-    # No need to verify merge commits
-    if _is_acceptable_merge_message(message):
-        return
+def _skip_on_merge(rule):
+    """Decorates a rule that doesn't apply to acceptable merge messages"""
 
-    try:
-        # No need to verify tag in case it is missing
-        C012_missing_type_tag(message, config)
-    except logging.Error:
+    @functools.wraps(rule)
+    def wrapper(message: CommitMessage, config: Configuration):
+        if _is_acceptable_merge_message(message):
+            return
+        return rule(message, config)
+
+    wrapper.skip_on_merge = True
+    return wrapper
+
+
+def applicable_rules(message: CommitMessage, config: Configuration) -> typing.List[str]:
+    """Identifiers of the enabled rules that apply to the provided message"""
+    if not _is_acceptable_merge_message(message):
+        return config.enabled_rules
+
+    # Leaves out the rules that would return right away anyway
+    return [rule for rule in config.enabled_rules if not getattr(config.rules[rule]["obj"], "skip_on_merge", False)]
+
+
+@functools.lru_cache(maxsize=256)
+def _closest_tag(type_tag: str, tags: typing.Tuple[str, ...]) -> typing.Optional[str]:
+    if fuzz_process is not None:
+        # Same 0.6 cutoff that difflib.get_close_matches() applies by default
+        closest_match = fuzz_process.extractOne(type_tag, tags, scorer=fuzz.ratio, score_cutoff=60)
+        return closest_match[0] if closest_match else None
+
+    closest_match = difflib.get_close_matches(type_tag, tags, n=1)
+    return closest_match[0] if closest_match else None
+
+
+@_skip_on_merge
+def C001_non_lower_case_type(message: CommitMessage, _: Configuration):
+    """The commit message's type tag should be in lower case"""
+    # No need to verify tag in case it is missing
+    if not message.type_tag:
         return
 
     if not message.type_tag.islower():
@@ -57,9 +143,10 @@ def C001_non_lower_case_type(message: CommitMessage, config: Configuration):
         )
 
 
+@_skip_on_merge
 def C002_one_whiteline_between_subject_and_body(message: CommitMessage, _: Configuration):
     """Only one empty line between subject and body"""
-    if _is_acceptable_merge_message(message) or not message.body:
+    if not message.body:
         return
 
     if len(message.lines) > 2 and message.lines[1].strip() == message.lines[2].strip() == "":
@@ -70,16 +157,11 @@ def C002_one_whiteline_between_subject_and_body(message: CommitMessage, _: Confi
         )
 
 
-def C003_title_case_description(message: CommitMessage, config: Configuration):
+@_skip_on_merge
+def C003_title_case_description(message: CommitMessage, _: Configuration):
     """The commit message's description should not start with a capital case letter"""
-    # No need to verify merge commits
-    if _is_acceptable_merge_message(message):
-        return
-
-    try:
-        # No need to run this rule in case the description is not present
-        C009_missing_description(message, config)
-    except logging.Error:
+    # No need to run this rule in case the description is not present
+    if not message.description:
         return
 
     first_word = message.description[0]
@@ -95,21 +177,15 @@ def C003_title_case_description(message: CommitMessage, config: Configuration):
         )
 
 
+@_skip_on_merge
 def C004_unknown_tag_type(message: CommitMessage, config: Configuration):
     """Commit message's subject should not contain an unknown tag type"""
-    # No need to verify merge commits
-    if _is_acceptable_merge_message(message):
-        return
-
-    try:
-        # No need to verify tag in case it is missing
-        C012_missing_type_tag(message, config)
-    except logging.Error:
+    # No need to verify tag in case it is missing
+    if not message.type_tag:
         return
 
     if message.type_tag not in config.tags:
-        closest_match = difflib.get_close_matches(message.type_tag.lower(), config.tags, n=1)
-        closest_match = closest_match[0] if closest_match else f"{', '.join(config.tags)}"
+        closest_match = _closest_tag(message.type_tag.lower(), tuple(config.tags)) or f"{', '.join(config.tags)}"
 
         raise logging.Error(
             message=f"{C004_unknown_tag_type.__doc__}. Use one of: feat, fix, {', '.join(config.tags)}",
@@ -119,17 +195,11 @@ def C004_unknown_tag_type(message: CommitMessage, config: Configuration):
         )
 
 
-def C005_separator_contains_trailing_whitespaces(message: CommitMessage, config: Configuration):
+@_skip_on_merge
+def C005_separator_contains_trailing_whitespaces(message: CommitMessage, _: Configuration):
     """No whitespace allowed before and only one whitespace allowed after the ":" separator"""
-    # No need to verify merge commits
-    if _is_acceptable_merge_message(message):
-        return
-
-    try:
-        # No need to verify for whitespacing when the separator is missing
-        C008_missing_separator(message, config)
-        C009_missing_description(message, config)
-    except logging.Error:
+    # No need to verify for whitespacing when the separator is missing
+    if (message.separator is not None and ":" not in message.separator) or not message.description:
         return
 
     if message.separator[0].isspace() or message.description[0].isspace():
@@ -158,15 +228,14 @@ def C006_scope_should_not_be_empty(message: CommitMessage, _: Configuration):
         )
 
 
-def C007_scope_contains_whitespace(message: CommitMessage, config: Configuration):
+def C007_scope_contains_whitespace(message: CommitMessage, _: Configuration):
     """The commit message's scope should not contain any whitespacing"""
     # NOTE: the scope is OPTIONAL
     if message.scope is None:
         return
 
-    try:
-        C006_scope_should_not_be_empty(message, config)
-    except logging.Error:
+    # Reported by C006 instead
+    if message.scope == "":
         return
 
     if len(message.scope) != len(message.scope.strip()):
@@ -178,12 +247,9 @@ def C007_scope_contains_whitespace(message: CommitMessage, config: Configuration
         )
 
 
+@_skip_on_merge
 def C008_missing_separator(message: CommitMessage, _: Configuration):
     """The commit message's subject requires a separator (": ") after the type tag"""
-    # No need to verify merge commits
-    if _is_acceptable_merge_message(message):
-        return
-
     if message.separator is not None and ":" not in message.separator:
         raise logging.Error(
             message=C008_missing_separator.__doc__,
@@ -256,18 +322,13 @@ def C012_missing_type_tag(message: CommitMessage, _: Configuration):
         )
 
 
-def C013_subject_should_not_end_with_punctuation(message: CommitMessage, config: Configuration):
+@_skip_on_merge
+def C013_subject_should_not_end_with_punctuation(message: CommitMessage, _: Configuration):
     """The commit message's subject should not end with punctuation"""
-    # No need to verify merge commits
-    if _is_acceptable_merge_message(message):
-        return
-
-    try:
-        C009_missing_description(message, config)
-    except logging.Error:
+    if not message.description:
         return
 
-    if re.match(r".*[.!?,]$", message.description):
+    if message.description.endswith(_TRAILING_PUNCTUATION):
         raise logging.Error(
             message=C013_subject_should_not_end_with_punctuation.__doc__,
             line=message.subject,
@@ -275,12 +336,9 @@ def C013_subject_should_not_end_with_punctuation(message: CommitMessage, config:
         )
 
 
+@_skip_on_merge
 def C014_subject_exceeds_line_lenght_limit(message: CommitMessage, config: Configuration):
     """The commit message's subject should be within the line length limit"""
-    # No need to verify merge commits
-    if _is_acceptable_merge_message(message):
-        return
-
     if len(message.subject) > config.max_subject_length:
         raise logging.Error(
             message=f"{C014_subject_exceeds_line_lenght_limit.__doc__} ({config.max_subject_length}), exceeded by {len(message.subject) - config.max_subject_length + 1} characters",
@@ -292,16 +350,14 @@ def C014_subject_exceeds_line_lenght_limit(message: CommitMessage, config: Confi
         )
 
 
-def C015_no_repeated_tags(message: CommitMessage, config: Configuration):
+def C015_no_repeated_tags(message: CommitMessage, _: Configuration):
     """Description should not start with a repetition of the tag"""
-    try:
-        # No need to verify repeated tags if the tag and description are missing
-        C012_missing_type_tag(message, config)
-        C009_missing_description(message, config)
-    except logging.Error:
+    # No need to verify repeated tags if the tag and description are missing
+    if not message.type_tag or not message.description:
         return
 
-    if message.description.lower().startswith(message.type_tag.lower()):
+    # Only lower the part of the description that could repeat the tag
+    if message.description[: len(message.type_tag)].lower() == message.type_tag.lower():
         raise logging.Error(
             message=C015_no_repeated_tags.__doc__,
             line=message.subject,
@@ -312,55 +368,16 @@ def C015_no_repeated_tags(message: CommitMessage, config: Configuration):
         )
 
 
-def C016_description_in_imperative_mood(message: CommitMessage, config: Configuration):
+def C016_description_in_imperative_mood(message: CommitMessage, _: Configuration):
     """The commit message's description should be written in imperative mood"""
-    try:
-        C009_missing_description(message, config)
-    except logging.Error:
+    if not message.description:
         return
 
-    common_non_imperative_verbs = (
-        "added",
-        "adds",
-        "adding",
-        "applied",
-        "applies",
-        "applying",
-        "edited",
-        "edits",
-        "editing",
-        "expanded",
-        "expands",
-        "expanding",
-        "fixed",
-        "fixes",
-        "fixing",
-        "removed",
-        "removes",
-        "removing",
-        "renamed",
-        "renames",
-        "renaming",
-        "deleted",
-        "deletes",
-        "deleting",
-        "updated",
-        "updates",
-        "updating",
-        "ensured",
-        "ensures",
-        "ensuring",
-        "resolved",
-        "resolves",
-        "resolving",
-        "verified",
-        "verifies",
-        "verifying",
-    )
-    blacklist = re.compile("|".join(re.escape(w) for w in common_non_imperative_verbs), re.IGNORECASE)
-    blacklisted_verbs = blacklist.match(message.description)
+    # Any description merely starting with one of these verbs is rejected, e.g. "Fixes:" or "Updated-ish" too
+    start = message.description[: _NON_IMPERATIVE_VERB_LENGTHS[-1]].lower()
+    blacklisted_verb = any(start[:length] in _NON_IMPERATIVE_VERBS for length in _NON_IMPERATIVE_VERB_LENGTHS)
 
-    if blacklisted_verbs:
+    if blacklisted_verb:
         raise logging.Error(
             message=C016_description_in_imperative_mood.__doc__,
             line=message.subject,
@@ -389,40 +406,27 @@ def C018_missing_empty_line_between_subject_and_body(message: CommitMessage, _:
         )
 
 
+@_skip_on_merge
 def C019_subject_contains_issue_reference(message: CommitMessage, _: Configuration):  # pylint:  disable=C0103
     """The commit message's subject should not contain a ticket reference"""
-    # No need to verify merge commits
-    if _is_acceptable_merge_message(message):
+    # Every issue reference contains a dash; don't bother the regex engine otherwise
+    if "-" not in message.subject:
         return
 
-    issue_regex = re.compile(
-        r"\b(?!"
-        + "|".join(
-            re.escape(i + "-")
-            for i in (
-                "AES",  # AES-128
-                "PEP",  # PEP-440
-                "SHA",  # SHA-256
-                "UTF",  # UTF-8
-                "VT",  # VT-220
-            )
-        )
-        + r")[A-Z]+-[0-9]+\b"
-    )
-    issues = issue_regex.findall(message.subject)
+    issue = next((m for m in _ISSUE_RE.finditer(message.subject) if m.group(1) not in _NON_ISSUE_PREFIXES), None)
 
-    if len(issue_regex.findall(message.subject)) > 0:
+    if issue:
         raise logging.Error(
             message=C019_subject_contains_issue_reference.__doc__,
             line=message.subject,
-            column_number=logging.Range(message.subject.find(issues[0]) + 1, len(issues[0])),
+            column_number=logging.Range(issue.start() + 1, len(issue.group())),
         )
 
 
 def C020_git_trailer_contains_whitespace(message: CommitMessage, _: Configuration):  # pylint:  disable=C0103
     """Git-trailer should not contain whitespace(s)"""
     for item in message.footers:
-        if " " in item.token and item.token != "BREAKING CHANGE":
+        if " " in item.token and not item.is_breaking:
             raise logging.Error(
                 message=C020_git_trailer_contains_whitespace.__doc__,
                 line=f"{item.token}: {item.value[0]}",
@@ -436,7 +440,7 @@ def C022_footer_contains_blank_line(message: CommitMessage, _: Configuration):
     if len(message.footers) >= 1:
         first_footer = 0
         # We allow for one paragraph after "BREAKING CHANGE" only, which _must_ be the first footer
-        if message.footers[0].token == BREAKING_CHANGE_TOKEN:
+        if message.footers[0].is_breaking:
             first_footer = 1
 
         if message.paragraph_separator in message.message[message.footer_start(first_footer) :]:
@@ -448,7 +452,7 @@ def C022_footer_contains_blank_line(message: CommitMessage, _: Configuration):
 def C023_breaking_change_must_be_first_git_trailer(message: CommitMessage, _: Configuration):
     """The BREAKING CHANGE git-trailer should be the first element in the footer"""
     for idx, item in enumerate(message.footers):
-        if item.token == BREAKING_CHANGE_TOKEN:
+        if item.is_breaking:
             if idx != 0:
                 raise logging.Error(
                     message=C023_breaking_change_must_be_first_git_trailer.__doc__,
@@ -457,18 +461,22 @@ def C023_breaking_change_must_be_first_git_trailer(message: CommitMessage, _: Co
                 )
 
 
+@functools.lru_cache(maxsize=None)
+def _default_configuration() -> Configuration:
+    """The (never modified) default configuration used for strict parsing"""
+    return Configuration()
+
+
 def validate_strict_default_rules(commit: CommitMessage):
     """Validates all default rules and raises a ParsingError if they do not all pass"""
-    config = Configuration()
-    error_messages = ""
-    error_count = 0
-    for rule in config.rules:
+    config = _default_configuration()
+    error_messages = []
+    for rule in applicable_rules(commit, config):
         result = validate_commit_message_rule(rule=rule, message=commit, config=config)
         if not result.passed:
-            error_count += 1
-            error_messages = f"{error_messages}{result.message}\n"
-    if error_count > 0:
-        raise ParsingError(error_messages)
+            error_messages.append(f"{result.message}\n")
+    if error_messages:
+        raise ParsingError("".join(error_messages))
 
 
 def validate_commit_message_rule(rule: str, message: CommitMessage, config: typing.Optional[Configuration]) -> RuleResult:
@@ -478,7 +486,7 @@ def validate_commit_message_rule(rule: str, message: CommitMessage, config: typi
 
     try:
         if config.rules[rule].get("enabled"):
-            get_default_rules()[rule].get("obj")(message, config)
+            config.rules[rule].get("obj")(message, config)
     except logging.Error as err:
         error_message = f"[{rule}] {err.message}"
         if not config.silent:
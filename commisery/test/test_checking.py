@@ -0,0 +1,64 @@
+# Copyright (c) 2022 - 2022 TomTom N.V. (https://tomtom.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import git
+import pytest
+
+from commisery import checking
+from commisery.config import Configuration
+
+
+@pytest.fixture()
+def repo(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # Annotated tags require a tagger identity
+    monkeypatch.setenv("GIT_COMMITTER_NAME", "Bob")
+    monkeypatch.setenv("GIT_COMMITTER_EMAIL", "bob@tester.org")
+    with git.Repo.init(tmp_path) as repo:
+        for message in ("feat: add something", "Bad commit", "fix: repair something"):
+            with open("test_file", "a") as f:
+                f.write(".")
+            repo.index.add(("test_file",))
+            repo.index.commit(message, author=git.Actor("Bob", "bob@tester.org"), committer=git.Actor("Bob", "bob@tester.org"))
+        yield repo
+
+
+def test_check_commits(repo, tmp_path):
+    config = Configuration(silent=True)
+    repo.create_tag("v1.0.0", ref="HEAD~2", message="Release 1.0.0")
+    message_file = tmp_path / "COMMIT_EDITMSG"
+    message_file.write_text("Bad message\n")
+
+    assert checking.check_commits(("HEAD", "HEAD~2"), config) == 0
+    assert checking.check_commits(("v1.0.0",), config) == 0
+    assert checking.check_commits(("HEAD", "HEAD~1", "v1.0.0"), config) == 1
+    assert checking.check_commits((repo.head.commit.hexsha, str(message_file), "HEAD~1"), config) == 2
+    assert checking.check_commit("v1.0.0", config) == 0
+
+    # Revision syntaxes that don't accept a suffix
+    assert checking.check_commit(":/repair", config) == 0
+    assert checking.check_commit(":/Bad", config) == 1
+    assert checking.check_commit("HEAD^@", config) == 1
+    assert checking.check_commits(("HEAD~1^@", ":/repair"), config) == 0
+
+
+@pytest.mark.parametrize("workers", (1, 2))
+def test_validate_commit_messages(workers):
+    messages = ("feat: add something", "Fix: Thing.", "Merge branch 'feature' into master")
+    results = checking.validate_commit_messages(messages * 3, workers=workers)
+    assert [[error.split(" ", 1)[0] for error in errors] for errors in results] == [
+        [],
+        ["[C001]", "[C003]", "[C004]", "[C013]"],
+        [],
+    ] * 3
@@ -17,6 +17,7 @@ from textwrap import dedent
 
 import pytest
 
+from commisery.cli import _may_be_rev_range
 from commisery.config import DEFAULT_ACCEPTED_TAGS
 
 log = logging.getLogger(__name__)
@@ -125,3 +126,40 @@ def test_cli_default_tags(commisery_cli, rev_range, commit):
 def test_single_commit_wrong_tag(commisery_cli):
     result = commisery_cli(commit_messages=("wibble: wrong tag",), rev_range=("HEAD",))
     assert result.exit_code == 1
+
+
+def test_cli_fail_fast(commisery_cli, caplog):
+    commits = ("feat: initial commit", "bad commit", "another bad commit")
+
+    result = commisery_cli(commits, rev_range=("HEAD~2..HEAD",))
+    assert result.exit_code == 1
+    assert "2 errors found" in caplog.text
+
+    caplog.clear()
+    result = commisery_cli(commits, rev_range=("--fail-fast", "HEAD~2..HEAD"))
+    assert result.exit_code == 1
+    assert "1 error found" in caplog.text
+
+
+@pytest.mark.parametrize(
+    "target, expected",
+    (
+        (("HEAD",), False),
+        (("feature/branch",), False),
+        (("0123456789abcdef0123456789abcdef01234567",), False),
+        # A file is never a range, even when its name looks like one
+        (("COMMIT..EDITMSG",), False),
+        (("HEAD~2..HEAD",), True),
+        (("main...feature",), True),
+        (("^main", "feature"), True),
+        (("HEAD^!",), True),
+        (("HEAD^@",), True),
+        (("--all",), True),
+        (("HEAD", "main"), True),
+    ),
+)
+def test_may_be_rev_range(tmp_path, monkeypatch, target, expected):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "COMMIT..EDITMSG").write_text("feat: add something\n")
+
+    assert _may_be_rev_range(target) == expected
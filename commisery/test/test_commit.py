@@ -144,6 +144,14 @@ def test_conventional_fixup_fix():
     assert message.has_fix()
 
 
+def test_bytes_message():
+    message = parse_commit_message("fix(ci): don't clean the workspace 🧹\n\nAcked-by: Alice\n".encode("UTF-8"))
+
+    assert message.type_tag == "fix"
+    assert message.description == "don't clean the workspace 🧹"
+    assert message.footers["Acked-by"] == ["Alice"]
+
+
 def test_basic_footers():
     message = parse_commit_message(
         """\
@@ -171,6 +179,20 @@ Acked-by: Bob <bob@example.com>
     )
 
 
+def test_non_ascii_footer_token():
+    # Like git trailers, footer tokens only consist of ASCII alphanumerics and '-'
+    message = parse_commit_message(
+        """\
+fix: something
+
+Geprüft-von: Alice <alice@example.com>
+Acked-by: Bob <bob@example.com>
+"""
+    )
+
+    assert tuple(tuple(footer) for footer in message.footers) == (("Acked-by", "Bob <bob@example.com>"),)
+
+
 def test_conventional_footers():
     message = parse_commit_message(
         """\
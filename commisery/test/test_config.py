@@ -27,6 +27,30 @@ def test_default_configuration():
     assert config.tags == DEFAULT_ACCEPTED_TAGS
 
 
+def test_custom_tags_leave_defaults_untouched():
+    """Validates that providing custom tags does not modify the provided or default tags"""
+    custom_tags = {"docs": "Documentation"}
+    config = Configuration()
+    config.tags = custom_tags
+
+    assert list(config.tags.keys()) == ["docs", "fix", "feat"]
+    assert custom_tags == {"docs": "Documentation"}
+    assert "docs" in DEFAULT_ACCEPTED_TAGS and Configuration().tags == DEFAULT_ACCEPTED_TAGS
+
+    with pytest.raises(TypeError):
+        Configuration().tags["foo"] = "bar"
+
+
+def test_enabled_rules():
+    """Validates that disabling a rule removes it from the enabled rules"""
+    config = Configuration()
+    assert config.enabled_rules == list(config.rules)
+
+    config.rules["C001"]["enabled"] = False
+    assert "C001" not in config.enabled_rules
+    assert len(config.enabled_rules) == len(config.rules) - 1
+
+
 def test_configuration_from_valid_yaml(tmp_path):
     """Validates initialization using valid yaml format"""
     config_path = tmp_path / ".commisery.yml"
@@ -44,6 +68,17 @@ tags:
     assert list(config.tags.keys()) == ["chore", "docs", "fix", "feat"]
 
 
+def test_configuration_from_json(tmp_path):
+    """Validates initialization using a JSON configuration file"""
+    config_path = tmp_path / "commisery.json"
+    config_path.write_text('{"max-subject-length": 120, "tags": {"docs": "Documentation"}, "disable": ["C001"]}')
+
+    config = Configuration.from_yaml(config_path)
+    assert config.max_subject_length == 120
+    assert list(config.tags.keys()) == ["docs", "fix", "feat"]
+    assert not config.rules["C001"]["enabled"]
+
+
 def test_configuration_from_invalid_yaml(tmp_path):
     """Validates initialization using invalid yaml format"""
     config_path = tmp_path / ".commisery.yml"
@@ -74,6 +109,24 @@ def test_configuration_from_invalid_yaml(tmp_path):
         Configuration.from_yaml(config_path)
 
 
+def test_configuration_from_cached_yaml(tmp_path):
+    """Validates that configurations read from the same file don't share state"""
+    config_path = tmp_path / ".commisery.yml"
+    config_path.write_text("disable:\n  - C001\ntags:\n  docs: Documentation\n")
+
+    config = Configuration.from_yaml(config_path)
+    config.rules["C002"]["enabled"] = False
+    config.tags["foo"] = "bar"
+
+    config = Configuration.from_yaml(config_path)
+    assert not config.rules["C001"]["enabled"]
+    assert config.rules["C002"]["enabled"]
+    assert "foo" not in config.tags
+
+    config_path.write_text("max-subject-length: 100\n")
+    assert Configuration.from_yaml(config_path).max_subject_length == 100
+
+
 def test_configuration_from_missing_yaml(tmp_path):
     """Validates incorrect file path resulting in default Configuration object"""
     assert Configuration.from_yaml(tmp_path / "does-not-exist.yml") == Configuration()
@@ -0,0 +1,81 @@
+# Copyright (c) 2022 - 2022 TomTom N.V. (https://tomtom.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import hmac
+import io
+import json
+
+import pytest
+
+from ..webhook import make_app
+
+SECRET = "It's a secret to everybody"
+
+
+def _post(app, event, payload, secret=SECRET):
+    body = payload if isinstance(payload, bytes) else json.dumps(payload).encode("UTF-8")
+    environ = {
+        "REQUEST_METHOD": "POST",
+        "CONTENT_LENGTH": str(len(body)),
+        "HTTP_X_GITHUB_EVENT": event,
+        "HTTP_X_HUB_SIGNATURE_256": "sha256=" + hmac.new(secret.encode("UTF-8"), body, hashlib.sha256).hexdigest(),
+        "wsgi.input": io.BytesIO(body),
+    }
+    status = []
+    response = b"".join(app(environ, lambda code, headers: status.append(code)))
+    return status[0], json.loads(response)
+
+
+@pytest.mark.parametrize(
+    "event, payload, expected_status, expected_errors",
+    (
+        ("push", {"commits": [{"message": "feat: add webhook"}, {"message": "fix: correct webhook"}]}, "200 OK", 0),
+        ("push", {"commits": [{"message": "feat: add webhook"}, {"message": "Bad commit"}]}, "200 OK", 1),
+        (
+            "pull_request",
+            {"action": "opened", "pull_request": {"title": "not conventional", "user": {"login": "bob"}}},
+            "200 OK",
+            1,
+        ),
+        ("pull_request", {"action": "closed", "pull_request": {"title": "not conventional"}}, "202 Accepted", None),
+        ("ping", {"zen": "Keep it logically awesome."}, "202 Accepted", None),
+        ("push", {"commits": [{"id": "no message"}]}, "400 Bad Request", None),
+    ),
+)
+def test_webhook_events(event, payload, expected_status, expected_errors):
+    status, response = _post(make_app(SECRET), event, payload)
+    assert status == expected_status
+    assert response.get("errors") == expected_errors
+
+
+def test_webhook_rejects_bad_signature():
+    status, _ = _post(make_app(SECRET), "push", {"commits": [{"message": "feat: add webhook"}]}, secret="wrong")
+    assert status == "401 Unauthorized"
+
+
+@pytest.mark.parametrize("body", (b"not json", b"[]", b"42"))
+def test_webhook_rejects_non_object_payload(body):
+    status, _ = _post(make_app(SECRET), "push", body)
+    assert status == "400 Bad Request"
+
+
+@pytest.mark.parametrize("config", ("disable:\n  - C999\n", "tags: 42\n"))
+def test_webhook_reports_invalid_configuration(tmp_path, config):
+    config_path = tmp_path / ".commisery.yml"
+    config_path.write_text(config)
+
+    status, response = _post(make_app(SECRET, config_path=str(config_path)), "push", {"commits": []})
+    assert status == "500 Internal Server Error"
+    assert response == {"error": "invalid configuration"}
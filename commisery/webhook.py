@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2022 - 2022 TomTom N.V. (https://tomtom.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import hmac
+import json
+import logging
+import typing
+
+import click
+import yaml
+
+from commisery.config import Configuration
+from commisery.github import DEPENDABOT_SUBJECT_LENGTH_OVERRIDE, DEPENDABOT_USER
+from . import checking
+
+PULL_REQUEST_ACTIONS = ("opened", "edited", "reopened", "synchronize")
+
+log = logging.getLogger(__name__)
+
+
+def verify_signature(secret: bytes, body: bytes, signature: typing.Optional[str]) -> bool:
+    """Tells whether `signature` is the `X-Hub-Signature-256` GitHub computed over `body` with `secret`"""
+    if not signature:
+        return False
+    expected = "sha256=" + hmac.new(secret, body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+def _pull_request_messages(payload: dict, token: typing.Optional[str]) -> typing.Iterator[str]:
+    pull_request = payload["pull_request"]
+    yield pull_request["title"]
+
+    # Pull request events don't carry the commits themselves, listing them takes a single paged request
+    if token is None:
+        return
+
+    from github import Github
+
+    repo = Github(token, per_page=100).get_repo(payload["repository"]["full_name"])
+    for commit_info in repo.get_pull(pull_request["number"]).get_commits():
+        yield commit_info.commit.message
+
+
+def check_event(event: str, payload: dict, config: Configuration, token: typing.Optional[str] = None) -> typing.Optional[int]:
+    """
+    Checks the commit messages delivered with a GitHub webhook event.
+
+    Push events include the pushed commits, so these are checked without contacting GitHub. For pull request events
+    the title is checked, together with the pull request's commits when a `token` is provided to list them with.
+
+    Returns the number of messages that failed validation, or None when the event is not one to check.
+    """
+    if event == "push":
+        messages = (commit["message"] for commit in payload.get("commits", ()))
+    elif event == "pull_request" and payload.get("action") in PULL_REQUEST_ACTIONS:
+        if payload["pull_request"]["user"]["login"] == DEPENDABOT_USER:
+            config.max_subject_length = DEPENDABOT_SUBJECT_LENGTH_OVERRIDE
+        messages = _pull_request_messages(payload, token)
+    else:
+        return None
+
+    return sum(checking.check_commit_message(message, config) for message in messages)
+
+
+def make_app(secret: str, config_path: typing.Optional[str] = None, token: typing.Optional[str] = None):
+    """Creates a WSGI application checking the commit messages of the GitHub webhook events posted to it"""
+    secret = secret.encode("UTF-8")
+
+    def app(environ, start_response):
+        def respond(status: str, **content):
+            body = json.dumps(content).encode("UTF-8")
+            start_response(status, [("Content-Type", "application/json"), ("Content-Length", str(len(body)))])
+            return [body]
+
+        if environ["REQUEST_METHOD"] != "POST":
+            return respond("405 Method Not Allowed", error="only POST is supported")
+
+        try:
+            length = int(environ.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            length = 0
+        body = environ["wsgi.input"].read(length)
+        if not verify_signature(secret, body, environ.get("HTTP_X_HUB_SIGNATURE_256")):
+            return respond("401 Unauthorized", error="invalid signature")
+
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return respond("400 Bad Request", error="payload is not valid JSON")
+        if not isinstance(payload, dict):
+            return respond("400 Bad Request", error="payload is not a JSON object")
+
+        # A broken configuration is the server's problem, not a sign of a malformed event
+        try:
+            config = Configuration.from_yaml(config_path)
+        except (OSError, KeyError, TypeError, ValueError, yaml.YAMLError):
+            log.exception("Invalid configuration")
+            return respond("500 Internal Server Error", error="invalid configuration")
+
+        event = environ.get("HTTP_X_GITHUB_EVENT", "")
+        try:
+            errors = check_event(event, payload, config, token=token)
+        except (KeyError, TypeError):
+            log.exception("Malformed '%s' event", event)
+            return respond("400 Bad Request", error=f"malformed '{event}' event")
+
+        if errors is None:
+            return respond("202 Accepted", event=event, checked=False)
+        return respond("200 OK", event=event, checked=True, errors=errors)
+
+    return app
+
+
+@click.command()
+@click.option("-s", "--secret", required=True, envvar="COMMISERY_WEBHOOK_SECRET", help="Webhook secret")
+@click.option("-t", "--token", envvar="GITHUB_TOKEN", help="GitHub Token, used to list the commits of Pull Requests")
+@click.option("-c", "--config", help="Path towards a configuration file")
+@click.option("--host", default="", help="Address to listen on")
+@click.option("--port", default=8080, show_default=True, help="Port to listen on")
+def main(secret: str, token: typing.Optional[str], config: typing.Optional[str], host: str, port: int) -> None:
+    from wsgiref.simple_server import make_server
+
+    with make_server(host, port, make_app(secret, config_path=config, token=token)) as server:
+        server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -39,9 +39,7 @@ setup(
       'click>=7.1.2,<9',
       'click-log',
       'GitPython>=3,<4',
-      'regex',
       'PyYAML',
-      'stemming>=1,<2',
       'dataclasses>=0.8,<1; python_version < "3.7.0"',
       'llvm-diagnostics>=3.0.0,<4',
       'inquirer2==1.0.0',
@@ -58,6 +56,9 @@ setup(
       'github': [
         'PyGithub>=1.53,<2',
       ],
+      'fuzzy': [
+        'rapidfuzz>=2,<4',
+      ],
     },
     use_scm_version={"relative_to": __file__},
     entry_points={
@@ -66,6 +67,7 @@ setup(
         'commisery = commisery.cli:main',
         'commisery-verify-msg = commisery.cli:check',
         'commisery-verify-github-pullrequest = commisery.github:main [github]',
+        'commisery-github-webhook = commisery.webhook:main',
       ],
       'hopic.plugins.yaml': [
         'commisery = commisery.hopic_template:commisery',